@@ -50,6 +50,13 @@ foreach(include_dir ${VISP_INCLUDE_DIRS})
 endforeach()
 string(JSON json_config_file SET ${json_config_file} "include_dirs" "${json_include_dirs}")
 
+# Preprocess headers with the built-in preprocessor of the generator instead of pcpp
+if(ENABLE_PYTHON_BINDINGS_FAST_PREPROCESSOR)
+  string(JSON json_config_file SET ${json_config_file} "fast_preprocess" "true")
+else()
+  string(JSON json_config_file SET ${json_config_file} "fast_preprocess" "false")
+endif()
+
 # For each bound module, add its headers and dependencies to config file
 set(json_modules "{}")
 foreach(module ${python_bound_modules})
@@ -0,0 +1,91 @@
+#############################################################################
+#
+# ViSP, open source Visual Servoing Platform software.
+# Copyright (C) 2005 - 2023 by Inria. All rights reserved.
+#
+# This software is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+# See the file LICENSE.txt at the root directory of this source
+# distribution for additional information about the GNU GPL.
+#
+# For using ViSP with software that can not be combined with the GNU
+# GPL, please contact Inria about acquiring a ViSP Professional
+# Edition License.
+#
+# See https://visp.inria.fr for more information.
+#
+# This software was developed at:
+# Inria Rennes - Bretagne Atlantique
+# Campus Universitaire de Beaulieu
+# 35042 Rennes Cedex
+# France
+#
+# If you have questions regarding the use of this file, please contact
+# Inria at visp@inria.fr
+#
+# This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+# WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+# Description:
+# Tests of the fast preprocessor of the Python bindings generator
+#
+#############################################################################
+
+from visp_python_bindgen.fast_preprocessor import FastPreprocessor, FastPreprocessorError, evaluate_expression
+from visp_python_bindgen.generator_config import PreprocessorConfig
+
+import pytest
+
+def make_preprocessor(defines={}) -> FastPreprocessor:
+  config = PreprocessorConfig(defines=defines, never_defined=[], include_directories=[], passthrough_includes_regex='',
+                              line_directive=None, other_args=[])
+  return FastPreprocessor(config)
+
+def preprocess(text: str) -> str:
+  return ' '.join(make_preprocessor().process(text).split())
+
+def test_evaluate_expression_precedence():
+  assert evaluate_expression('1 + 2 * 3') == 7
+  assert evaluate_expression('(1 + 2) * 3') == 9
+  assert evaluate_expression('1 << 2 + 1') == 8
+  assert evaluate_expression('1 || 0 && 0') == 1
+  assert evaluate_expression('2 > 1 == 1') == 1
+
+def test_evaluate_expression_unary_and_ternary():
+  assert evaluate_expression('!0') == 1
+  assert evaluate_expression('-3 + ~0') == -4
+  assert evaluate_expression('1 ? 2 : 3') == 2
+  assert evaluate_expression('0 ? 2 : 0 ? 3 : 4') == 4
+
+def test_evaluate_expression_c_semantics():
+  assert evaluate_expression('-7 / 2') == -3
+  assert evaluate_expression('-7 % 2') == -1
+  assert evaluate_expression('010') == 8
+  assert evaluate_expression('0x10') == 16
+
+def test_evaluate_expression_errors():
+  with pytest.raises(FastPreprocessorError):
+    evaluate_expression('1 / 0')
+  with pytest.raises(FastPreprocessorError):
+    evaluate_expression('(1 + 2')
+  with pytest.raises(FastPreprocessorError):
+    evaluate_expression('1 2')
+
+def test_if_directives():
+  preprocessor = make_preprocessor({'VISP_HAVE_A': None, 'VERSION': '3'})
+  assert preprocessor.evaluate('defined(VISP_HAVE_A) && !defined VISP_HAVE_B')
+  assert preprocessor.evaluate('VERSION >= 3L && UNDEFINED_MACRO == 0')
+  text = '#if VERSION > 3\nint a;\n#elif defined(VISP_HAVE_A)\nint b;\n#else\nint c;\n#endif\n'
+  assert preprocessor.process(text).split() == ['int', 'b;']
+
+def test_expansion_rescans_following_text():
+  assert preprocess('#define G(x) int x;\n#define F G\nF(a)\n') == 'int a;'
+  assert preprocess('#define G(x) int x;\n#define F(y) y G\nF(const)(a)\n') == 'const int a;'
+  assert preprocess('#define G(x) int x;\n#define F G\nF\n') == 'G'
+
+def test_self_referencing_macros():
+  assert preprocess('#define A A + 1\nA\n') == 'A + 1'
+  with pytest.raises(FastPreprocessorError):
+    preprocess('#define f(x) x f\nf(1)(2)\n')
@@ -86,13 +86,9 @@ def to_cstring(s: str) -> str:
 
   # On Windows, strings have a maximum length.
   per_string_limit = 8192
-  current_char = 0
-  result = ''
-  while current_char < len(s):
-    result += f'''R"doc({s[current_char: min((current_char + per_string_limit), len(s))]})doc"
-  '''
-    current_char += per_string_limit
-  return result
+  chunks = [f'''R"doc({s[current_char: current_char + per_string_limit]})doc"
+  ''' for current_char in range(0, len(s), per_string_limit)]
+  return ''.join(chunks)
 
 
 @dataclass
@@ -447,7 +443,7 @@ class DocumentationHolder(object):
       from functools import reduce
       name_list: List[doxmlparser.compound.docParamName] = reduce(lambda all, pnl: all + pnl.parametername,  param_info.parameternamelist, [])
       param_descr: doxmlparser.compound.descriptionType = param_info.parameterdescription
-      param_descr_str = ' '.join(map(lambda para: process_paragraph(para, 0), param_descr.para)).lstrip(': ').strip().replace('\n', '\n\t')
+      param_descr_str = ' '.join([process_paragraph(para, 0) for para in param_descr.para]).lstrip(': ').strip().replace('\n', '\n\t')
       for param_name in name_list:
         params_dict[param_name.valueOf_] = param_descr_str
     return params_dict
@@ -459,5 +455,5 @@ class DocumentationHolder(object):
       sections: List[doxmlparser.docSimpleSectType] = paragraph.simplesect
       for sect in sections:
         if sect.kind == 'return':
-          return_str += ' '.join(map(lambda para: process_paragraph(para, 0), sect.para))
+          return_str += ' '.join([process_paragraph(para, 0) for para in sect.para])
     return return_str
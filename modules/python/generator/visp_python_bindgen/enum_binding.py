@@ -48,6 +48,8 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
   from visp_python_bindgen.header import SingleObjectBindings, HeaderFile
 
+log = logging.getLogger(__name__)
+
 @dataclass
 class EnumRepr:
   '''
@@ -133,8 +135,7 @@ def resolve_enums_and_typedefs_to_enums(root_scope: NamespaceScope, mapping: Dic
         if base_ref is not None and isinstance(base_ref, types.EnumDecl) and base_ref.access is not None and base_ref.access != 'public':
           public_access = False
 
-      matches = lambda repr: match_id(repr, enum_id) or match_name(repr, full_name)
-      matching = list(filter(matches, temp_data))
+      matching = [repr for repr in temp_data if match_id(repr, enum_id) or match_name(repr, full_name)]
       assert len(matching) <= 1, f"There cannot be more than one repr found. Matches = {matching}"
       if len(matching) == 0:
         temp_data.append(EnumRepr(enum_id, full_name, enum.values, public_access))
@@ -155,8 +156,7 @@ def resolve_enums_and_typedefs_to_enums(root_scope: NamespaceScope, mapping: Dic
       anonymous_enum, enum_id = is_anonymous_name(typedef.type.typename)
       full_name = mapping[typedef.name]
 
-      matches = lambda repr: match_id(repr, enum_id) or match_name(repr, full_name)
-      matching = list(filter(matches, temp_data))
+      matching = [repr for repr in temp_data if match_id(repr, enum_id) or match_name(repr, full_name)]
       assert len(matching) <= 1, f"There cannot be more than one repr found. Matches = {matching}"
       if len(matching) == 0:
         temp_data.append(EnumRepr(enum_id, full_name, None, public_access))
@@ -165,7 +165,7 @@ def resolve_enums_and_typedefs_to_enums(root_scope: NamespaceScope, mapping: Dic
           matching[0].name = full_name
         matching[0].public_access = matching[0].public_access and public_access
 
-    ready_enums = list(filter(enum_repr_is_ready, temp_data))
+    ready_enums = [repr for repr in temp_data if enum_repr_is_ready(repr)]
     for repr in ready_enums:
       final_data.append(repr)
       temp_data.remove(repr)
@@ -178,7 +178,7 @@ def get_enum_bindings(root_scope: NamespaceScope, mapping: Dict, submodule: Subm
   final_data, filtered_reprs = resolve_enums_and_typedefs_to_enums(root_scope, mapping)
 
   for repr in filtered_reprs:
-    logging.info(f'Enum {repr} was ignored, because it is incomplete (missing values or name)')
+    log.info('Enum %s was ignored, because it is incomplete (missing values or name)', repr)
 
   result: List['SingleObjectBindings'] = []
   final_reprs = []
@@ -187,12 +187,11 @@ def get_enum_bindings(root_scope: NamespaceScope, mapping: Dict, submodule: Subm
     enum_config = submodule.get_enum_config(repr.name)
     if enum_config['ignore']:
       filtered_reprs.append(repr)
-      logging.info(f'Enum {repr.name} is ignored by user')
+      log.info('Enum %s is ignored by user', repr.name)
     elif repr.public_access:
       final_reprs.append(repr)
     else:
       filtered_reprs.append(repr)
-  doc_holder = header.documentation_holder
   for enum_repr in final_reprs:
     name_segments = enum_repr.name.split('::')
     py_name = name_segments[-1].replace('vp', '')
@@ -200,7 +199,7 @@ def get_enum_bindings(root_scope: NamespaceScope, mapping: Dict, submodule: Subm
     parent_ignored = False
     ignored_parent_name = None
     enum_doc = None
-    if doc_holder is not None:
+    if header.documentation_holder is not None:
       enum_doc = header.documentation_holder.get_documentation_for_enum(repr.name)
 
     for segment in name_segments[:-1]:
@@ -211,7 +210,7 @@ def get_enum_bindings(root_scope: NamespaceScope, mapping: Dict, submodule: Subm
         break
 
     if parent_ignored:
-      logging.info(f'Ignoring enum {py_name} because {ignored_parent_name} is ignored')
+      log.info('Ignoring enum %s because %s is ignored', py_name, ignored_parent_name)
       continue
 
     owner_full_name = '::'.join(name_segments[:-1])
@@ -0,0 +1,410 @@
+#############################################################################
+#
+# ViSP, open source Visual Servoing Platform software.
+# Copyright (C) 2005 - 2023 by Inria. All rights reserved.
+#
+# This software is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+# See the file LICENSE.txt at the root directory of this source
+# distribution for additional information about the GNU GPL.
+#
+# For using ViSP with software that can not be combined with the GNU
+# GPL, please contact Inria about acquiring a ViSP Professional
+# Edition License.
+#
+# See https://visp.inria.fr for more information.
+#
+# This software was developed at:
+# Inria Rennes - Bretagne Atlantique
+# Campus Universitaire de Beaulieu
+# 35042 Rennes Cedex
+# France
+#
+# If you have questions regarding the use of this file, please contact
+# Inria at visp@inria.fr
+#
+# This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+# WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+# Description:
+# ViSP Python bindings generator
+#
+#############################################################################
+
+'''
+A lightweight, in-process replacement for pcpp.
+It handles conditional compilation, #define/#undef and the expansion of object-like and function-like macros,
+which is all that is needed for most ViSP headers once their includes have been removed.
+When a construct is not supported (stringification, token pasting, unbalanced conditionals...),
+a FastPreprocessorError is raised and the caller should fall back to pcpp.
+'''
+
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+from dataclasses import dataclass
+from pathlib import Path
+import operator
+import re
+
+from visp_python_bindgen.generator_config import PreprocessorConfig
+
+class FastPreprocessorError(RuntimeError):
+  '''
+  Raised when the fast preprocessor encounters a construct it does not handle.
+  '''
+  pass
+
+@dataclass
+class Macro:
+  params: Optional[List[str]] # None for object-like macros
+  body: str
+
+# Comments and string/char literals (so that comment markers inside literals are left untouched)
+COMMENT_OR_LITERAL_REGEX = re.compile(r'//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'', re.DOTALL)
+DIRECTIVE_REGEX = re.compile(r'^\s*#\s*(\w*)(.*)$')
+DEFINE_REGEX = re.compile(r'([A-Za-z_]\w*)(?:\(([^)]*)\))?(.*)$', re.DOTALL)
+INCLUDE_REGEX = re.compile(r'\s*[<"]([^>"]+)[>"]')
+DEFINED_REGEX = re.compile(r'\bdefined\s*(?:\(\s*([A-Za-z_]\w*)\s*\)|([A-Za-z_]\w*))')
+# Tokens that matter for macro expansion. Literals and numbers are matched so that their content is never expanded
+EXPANSION_TOKEN_REGEX = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|[A-Za-z_]\w*|\d[\w.]*')
+IDENTIFIER_REGEX = re.compile(r'\b[A-Za-z_]\w*')
+INTEGER_SUFFIX_REGEX = re.compile(r'\b(0[xX][0-9a-fA-F]+|\d+)[uUlL]+\b')
+EXPRESSION_TOKEN_REGEX = re.compile(r'\s*(0[xX][0-9a-fA-F]+|\d+|&&|\|\||<<|>>|<=|>=|==|!=|[-+*/%<>&^|!~()?:])')
+
+def _c_div(a: int, b: int) -> int:
+  return int(a / b) # C integer division truncates towards 0
+
+def _c_mod(a: int, b: int) -> int:
+  return a - _c_div(a, b) * b
+
+BINARY_OPERATORS = {
+  '*': (10, operator.mul), '/': (10, _c_div), '%': (10, _c_mod),
+  '+': (9, operator.add), '-': (9, operator.sub),
+  '<<': (8, operator.lshift), '>>': (8, operator.rshift),
+  '<': (7, lambda a, b: int(a < b)), '<=': (7, lambda a, b: int(a <= b)),
+  '>': (7, lambda a, b: int(a > b)), '>=': (7, lambda a, b: int(a >= b)),
+  '==': (6, lambda a, b: int(a == b)), '!=': (6, lambda a, b: int(a != b)),
+  '&': (5, operator.and_),
+  '^': (4, operator.xor),
+  '|': (3, operator.or_),
+  '&&': (2, lambda a, b: int(bool(a) and bool(b))),
+  '||': (1, lambda a, b: int(bool(a) or bool(b))),
+}
+
+UNARY_OPERATORS = {
+  '!': lambda a: int(not a),
+  '~': operator.invert,
+  '-': operator.neg,
+  '+': operator.pos,
+}
+
+def evaluate_expression(expression: str) -> int:
+  '''
+  Evaluate an integer constant expression, as found in an #if directive once macros have been expanded.
+  '''
+  expression = expression.strip()
+  tokens = []
+  pos = 0
+  while pos < len(expression):
+    match = EXPRESSION_TOKEN_REGEX.match(expression, pos)
+    if match is None:
+      raise FastPreprocessorError(f'Unsupported expression: {expression}')
+    tokens.append(match.group(1))
+    pos = match.end()
+  tokens.append(None) # End marker
+  index = 0
+
+  def next_token() -> Optional[str]:
+    nonlocal index
+    token = tokens[index]
+    index = min(index + 1, len(tokens) - 1)
+    return token
+
+  def parse_unary() -> int:
+    token = next_token()
+    if token in UNARY_OPERATORS:
+      return UNARY_OPERATORS[token](parse_unary())
+    if token == '(':
+      value = parse_binary(0)
+      if next_token() != ')':
+        raise FastPreprocessorError(f'Unbalanced parentheses in expression: {expression}')
+      return value
+    if token is not None and token[0].isdigit():
+      if token[0] == '0' and len(token) > 1 and token[1] not in 'xX':
+        return int(token, 8)
+      return int(token, 0)
+    raise FastPreprocessorError(f'Unexpected token {token} in expression: {expression}')
+
+  def parse_binary(min_precedence: int) -> int:
+    value = parse_unary()
+    while True:
+      token = tokens[index]
+      if token == '?' and min_precedence == 0: # Ternary operator, right associative
+        next_token()
+        if_true = parse_binary(0)
+        if next_token() != ':':
+          raise FastPreprocessorError(f'Invalid ternary operator in expression: {expression}')
+        if_false = parse_binary(0)
+        value = if_true if value else if_false
+      elif token in BINARY_OPERATORS and BINARY_OPERATORS[token][0] >= min_precedence:
+        next_token()
+        precedence, fn = BINARY_OPERATORS[token]
+        value = fn(value, parse_binary(precedence + 1))
+      else:
+        return value
+
+  try:
+    value = parse_binary(0)
+  except ZeroDivisionError:
+    raise FastPreprocessorError(f'Division by zero in expression: {expression}')
+  if tokens[index] is not None:
+    raise FastPreprocessorError(f'Unexpected token {tokens[index]} in expression: {expression}')
+  return value
+
+def parse_macro_arguments(text: str, pos: int) -> Tuple[Optional[List[str]], int]:
+  '''
+  Parse the arguments of a function-like macro invocation, starting after the macro name.
+  Returns None if the name is not followed by a parenthesis (the macro should then not be expanded),
+  otherwise the list of arguments and the position after the closing parenthesis.
+  '''
+  start = pos
+  while pos < len(text) and text[pos].isspace():
+    pos += 1
+  if pos >= len(text) or text[pos] != '(':
+    return None, start
+  args = []
+  depth = 0
+  arg_start = pos + 1
+  while pos < len(text):
+    c = text[pos]
+    if c in '"\'':
+      literal = EXPANSION_TOKEN_REGEX.match(text, pos)
+      if literal is None:
+        raise FastPreprocessorError('Unterminated literal in macro arguments')
+      pos = literal.end()
+      continue
+    if c == '(':
+      depth += 1
+    elif c == ')':
+      depth -= 1
+      if depth == 0:
+        args.append(text[arg_start:pos].strip())
+        return args, pos + 1
+    elif c == ',' and depth == 1:
+      args.append(text[arg_start:pos].strip())
+      arg_start = pos + 1
+    pos += 1
+  raise FastPreprocessorError('Unterminated macro invocation')
+
+class FastPreprocessor():
+  def __init__(self, config: PreprocessorConfig):
+    self.macros: Dict[str, Macro] = {}
+    self.never_defined: Set[str] = set(config.never_defined)
+    self.include_directories = [Path(include_dir) for include_dir in config.include_directories]
+    self.visited_files: Set[Path] = set()
+    for name, value in config.defines.items():
+      # Same convention as the command line of pcpp and compilers: -D A is equivalent to -D A=1
+      self.define(f'{name} {value if value is not None else "1"}')
+
+  def define(self, definition: str) -> None:
+    match = DEFINE_REGEX.match(definition.strip())
+    if match is None:
+      raise FastPreprocessorError(f'Invalid macro definition: {definition}')
+    name, params_str, body = match.groups()
+    if name in self.never_defined:
+      return
+    params = None
+    if params_str is not None:
+      params = [param.strip() for param in params_str.split(',') if len(param.strip()) > 0]
+    self.macros[name] = Macro(params, body.strip())
+
+  def include(self, include_name: str) -> None:
+    '''
+    Process a header found in the include directories, only to collect the macros it defines.
+    Headers that cannot be found are ignored, as pcpp does with --passthru-unfound-includes.
+    '''
+    for include_dir in self.include_directories:
+      include_path = include_dir / include_name
+      if include_path.exists():
+        if include_path not in self.visited_files:
+          self.visited_files.add(include_path)
+          self.process(include_path.read_text(encoding='utf-8'))
+        return
+
+  def process(self, text: str) -> str:
+    '''
+    Preprocess a source text and return the code that remains active, with macros expanded.
+    Directives are not part of the output.
+    '''
+    text = text.replace('\\\n', '') # Line continuations
+    text = COMMENT_OR_LITERAL_REGEX.sub(lambda m: m.group() if m.group()[0] in '"\'' else ' ', text)
+
+    output = []
+    code_lines = []
+    def flush_code() -> None:
+      if len(code_lines) > 0:
+        output.append(self.expand('\n'.join(code_lines)))
+        code_lines.clear()
+
+    conditions_stack: List[Tuple[bool, bool]] = [] # For each nested conditional: (parent is active, a branch has already been taken)
+    active = True
+    for line in text.split('\n'):
+      match = DIRECTIVE_REGEX.match(line)
+      if match is None:
+        if active:
+          code_lines.append(line)
+        continue
+      flush_code()
+      directive, args = match.group(1), match.group(2).strip()
+      if directive in ['if', 'ifdef', 'ifndef']:
+        condition = False
+        if active:
+          if directive == 'if':
+            condition = self.evaluate(args)
+          else:
+            condition = (args.split()[0] in self.macros) == (directive == 'ifdef')
+        conditions_stack.append((active, condition))
+        active = active and condition
+      elif directive in ['elif', 'else', 'endif']:
+        if len(conditions_stack) == 0:
+          raise FastPreprocessorError(f'#{directive} without matching #if')
+        parent_active, branch_taken = conditions_stack[-1]
+        if directive == 'endif':
+          conditions_stack.pop()
+          active = parent_active
+        elif directive == 'else':
+          active = parent_active and not branch_taken
+          conditions_stack[-1] = (parent_active, True)
+        else:
+          active = parent_active and not branch_taken and self.evaluate(args)
+          conditions_stack[-1] = (parent_active, branch_taken or active)
+      elif not active:
+        continue
+      elif directive == 'define':
+        self.define(args)
+      elif directive == 'undef':
+        self.macros.pop(args.split()[0], None)
+      elif directive == 'include':
+        include_match = INCLUDE_REGEX.match(args)
+        if include_match is not None:
+          self.include(include_match.group(1))
+      # Other directives (#pragma, #error, #warning...) are dropped
+
+    if len(conditions_stack) > 0:
+      raise FastPreprocessorError('Unterminated #if')
+    flush_code()
+    return '\n'.join(output) + '\n'
+
+  def evaluate(self, expression: str) -> bool:
+    expression = DEFINED_REGEX.sub(lambda m: '1' if (m.group(1) or m.group(2)) in self.macros else '0', expression)
+    expression = self.expand(expression)
+    expression = re.sub(r'\btrue\b', '1', expression)
+    expression = INTEGER_SUFFIX_REGEX.sub(r'\1', expression)
+    expression = IDENTIFIER_REGEX.sub('0', expression) # Identifiers that are not macros evaluate to 0
+    return evaluate_expression(expression) != 0
+
+  def expand(self, text: str, hidden: FrozenSet[str] = frozenset()) -> str:
+    '''
+    Expand the macros contained in text.
+    Macros in hidden are not expanded, to prevent infinite recursion when a macro refers to itself.
+    '''
+    result = []
+    copied_until = 0
+    pos = 0
+    while True:
+      match = EXPANSION_TOKEN_REGEX.search(text, pos)
+      if match is None:
+        break
+      pos = match.end()
+      name = match.group()
+      macro = self.macros.get(name)
+      if macro is None or name in hidden:
+        continue
+      if '#' in macro.body:
+        raise FastPreprocessorError(f'Stringification and token pasting are not supported (macro {name})')
+      if macro.params is None:
+        replacement = macro.body
+      else:
+        args, pos = parse_macro_arguments(text, pos)
+        if args is None: # Function-like macro name without arguments: not an invocation
+          continue
+        replacement = self.substitute_arguments(name, macro, args, hidden)
+      expansion = self.expand(replacement, hidden | {name})
+      # As in a C preprocessor, the expansion is rescanned along with the rest of the text:
+      # if it ends with the name of a function-like macro, its arguments follow the expansion
+      while True:
+        last_token = self.trailing_function_macro(expansion)
+        if last_token is None:
+          break
+        call_args, call_end = parse_macro_arguments(text, pos)
+        if call_args is None:
+          break
+        called_name = last_token.group()
+        if called_name in hidden or called_name == name:
+          raise FastPreprocessorError(f'Recursive invocation of macro {called_name} through the expansion of {name}')
+        called_replacement = self.substitute_arguments(called_name, self.macros[called_name], call_args, hidden)
+        expansion = expansion[:last_token.start()] + self.expand(called_replacement, hidden | {called_name})
+        pos = call_end
+      result.append(text[copied_until:match.start()])
+      result.append(expansion)
+      copied_until = pos
+    result.append(text[copied_until:])
+    return ''.join(result)
+
+  def trailing_function_macro(self, text: str) -> Optional[re.Match]:
+    '''
+    If text ends with the name of a function-like macro, return the match of this name.
+    '''
+    last_token = None
+    for last_token in EXPANSION_TOKEN_REGEX.finditer(text):
+      pass
+    if last_token is None or len(text[last_token.end():].strip()) > 0:
+      return None
+    macro = self.macros.get(last_token.group())
+    if macro is None or macro.params is None:
+      return None
+    return last_token
+
+  def substitute_arguments(self, name: str, macro: Macro, args: List[str], hidden: FrozenSet[str]) -> str:
+    params = macro.params
+    if len(params) == 0 and args == ['']:
+      args = []
+    values: Dict[str, str] = {}
+    if len(params) > 0 and params[-1] == '...':
+      if len(args) < len(params) - 1:
+        raise FastPreprocessorError(f'Wrong number of arguments when invoking macro {name}')
+      values['__VA_ARGS__'] = ', '.join(args[len(params) - 1:])
+      params = params[:-1]
+      args = args[:len(params)]
+    elif len(args) != len(params):
+      raise FastPreprocessorError(f'Wrong number of arguments when invoking macro {name}')
+    for param, arg in zip(params, args):
+      values[param] = self.expand(arg, hidden)
+    return EXPANSION_TOKEN_REGEX.sub(lambda m: values.get(m.group(), m.group()), macro.body)
+
+# State of the preprocessor after processing the forced includes, per config and forced includes. See fast_preprocess
+_PREAMBLE_STATES: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], Tuple[Dict[str, Macro], Set[Path]]] = {}
+
+def fast_preprocess(header_content: str, forced_includes: List[str], config: PreprocessorConfig) -> Tuple[str, List[Path]]:
+  '''
+  Preprocess the content of a header (whose includes have already been removed) without calling pcpp.
+  The forced includes are looked up in the include directories of the config and only contribute their macros.
+  They are processed once per process, and every header starts from the resulting macros.
+  Returns the preprocessed content and the files that were included to obtain it.
+  Raises a FastPreprocessorError if the header uses constructs that are not supported.
+  '''
+  key = (tuple(config.to_pcpp_args_list()), tuple(forced_includes))
+  if key not in _PREAMBLE_STATES:
+    preamble_preprocessor = FastPreprocessor(config)
+    for include in forced_includes:
+      preamble_preprocessor.include(include)
+    _PREAMBLE_STATES[key] = (preamble_preprocessor.macros, preamble_preprocessor.visited_files)
+
+  preamble_macros, preamble_visited_files = _PREAMBLE_STATES[key]
+  preprocessor = FastPreprocessor(config)
+  # Copies: the header may define or undefine macros
+  preprocessor.macros = dict(preamble_macros)
+  preprocessor.visited_files = set(preamble_visited_files)
+  preprocessed_content = preprocessor.process(header_content)
+  return preprocessed_content, sorted(preprocessor.visited_files)
@@ -36,9 +36,11 @@
 from typing import List
 import sys
 from pathlib import Path
-from multiprocessing import Pool
+from concurrent.futures import Future, ProcessPoolExecutor
 import argparse
 import logging
+import logging.handlers
+import multiprocessing
 
 from cxxheaderparser.errors import CxxParseError
 
@@ -46,25 +48,55 @@ from visp_python_bindgen.header import *
 from visp_python_bindgen.submodule import *
 from visp_python_bindgen.generator_config import GeneratorConfig
 
-def header_preprocess(header: HeaderFile):
+log = logging.getLogger(__name__)
+
+def init_worker_logging(log_queue: multiprocessing.Queue, level: int) -> None:
+  '''
+  Initializer of the preprocessing worker processes: send their log records to the main process through a queue.
+  Depending on the start method, workers would otherwise either not log at all (spawn),
+  or all write to the log file opened by the main process (fork).
   '''
-  Preprocess a single header. Supposed to be called from a subprocess.
+  root_logger = logging.getLogger()
+  for handler in root_logger.handlers[:]:
+    root_logger.removeHandler(handler)
+  root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+  root_logger.setLevel(level)
+
+def get_header_preprocessing_result(header: HeaderFile, result: Future) -> bool:
+  '''
+  Retrieve the result of the preprocessing of a single header, that was run in a worker process.
+  Returns whether the preprocessing was successful.
   '''
   try:
-    header.preprocess()
-    return header
+    header.set_preprocessing_result(*result.result())
+    return True
   except Exception as e:
     error_msg = 'There was an error when processing header' +  str(header.path)
-    logging.error(error_msg)
+    log.error(error_msg)
     import traceback
-    logging.error(traceback.format_exc())
-    logging.error(type(e))
+    log.error(''.join(traceback.format_exception(type(e), e, e.__traceback__)))
+    log.error(type(e))
     if isinstance(e, CxxParseError):
-      logging.error(header.preprocessed_header_str)
+      # The preprocessed header is not returned by the worker process on failure: run the preprocessor again to log it
+      log.error(run_preprocessor(*header.get_preprocessing_args())[0])
 
     print(error_msg, 'See the text log in the build folder for more information.')
 
-    return None
+    return False
+
+def prune_ast_cache(headers: List[HeaderFile]) -> None:
+  '''
+  Remove the cache entries of headers that are not part of the generation anymore (e.g., deleted or ignored headers),
+  so that the on disk cache only holds one entry per generated header.
+  '''
+  cache_paths = set(header._get_ast_cache_path() for header in headers)
+  for cache_dir in set(cache_path.parent for cache_path in cache_paths):
+    if not cache_dir.exists():
+      continue
+    for cache_path in cache_dir.glob('*.pkl'):
+      if cache_path not in cache_paths:
+        log.info('Removing outdated cache entry %s', cache_path)
+        cache_path.unlink()
 
 def main_str(submodule_fn_declarations, submodule_fn_calls):
   '''
@@ -98,34 +130,39 @@ def generate_module(generate_path: Path, config_path: Path) -> None:
     all_headers.extend(submodule.headers)
 
   from tqdm import tqdm
-  # Parallel processing of headers to speedup this step
-  # This parallel implementation is disabled,
-  # since the behaviour on Mac is different and leads to preprocessing not finding vpConfig.h and others
-  # Reverting to a single process version fixes the issue
-
-  # with Pool() as pool:
-  #   new_all_headers = []
-  #   for result in list(tqdm(pool.imap(header_preprocess, all_headers), total=len(all_headers), file=sys.stderr)):
-  #     if result is None:
-  #       raise RuntimeError('There was an exception when processing headers: You should either ignore the faulty header/class, or fix the generator code!')
-  #     new_all_headers.append(result)
-
-  new_all_headers = []
-  for result in list(tqdm(map(header_preprocess, all_headers), total=len(all_headers), file=sys.stderr, unit="hdr")):
-    if result is None:
-      raise RuntimeError('There was an exception when processing headers: You should either ignore the faulty header/class, or fix the generator code!')
-    new_all_headers.append(result)
+  # Parallel processing of headers to speedup this step. Headers whose preprocessing result is cached are skipped.
+  # The worker processes only rely on the arguments of preprocess_header, not on GeneratorConfig:
+  # with the "spawn" start method (default on Mac and Windows), the configuration loaded from the main config file is not
+  # available in the workers, which would lead to preprocessing not finding vpConfig.h and others
+  headers_to_preprocess = [header for header in all_headers if not header.load_cached_preprocessing_result()]
+  prune_ast_cache(all_headers)
+  # Log records of the workers are written by the handlers of the main process
+  root_logger = logging.getLogger()
+  log_queue = multiprocessing.Queue()
+  log_listener = logging.handlers.QueueListener(log_queue, *root_logger.handlers, respect_handler_level=True)
+  log_listener.start()
+  try:
+    # With max_workers=None, one worker per CPU is used, with the limit of 61 workers that applies on Windows
+    with ProcessPoolExecutor(max_workers=None, initializer=init_worker_logging, initargs=(log_queue, root_logger.level)) as executor:
+      results = [executor.submit(preprocess_header, *header.get_preprocessing_args()) for header in headers_to_preprocess]
+      for header, result in tqdm(zip(headers_to_preprocess, results), total=len(headers_to_preprocess), file=sys.stderr, unit="hdr"):
+        if not get_header_preprocessing_result(header, result):
+          # Do not wait for the remaining headers before reporting the error
+          for other_result in results:
+            other_result.cancel()
+          raise RuntimeError('There was an exception when processing headers: You should either ignore the faulty header/class, or fix the generator code!')
+  finally:
+    log_listener.stop()
+  new_all_headers = all_headers
 
   # Sort headers according to the dependencies. This is done across all modules.
   # TODO: sort module generation order. For now this works but it's fairly brittle
   new_all_headers = sort_headers(new_all_headers)
-  for header in new_all_headers:
-    header.compute_environment()
 
-  headers_with_deps = list(map(lambda header: (header, header.get_header_dependencies(new_all_headers)), new_all_headers))
+  headers_dependencies = get_headers_dependencies(new_all_headers)
 
-  for header, header_deps in headers_with_deps:
-    other_mappings = list(map(lambda h: h.environment.mapping, header_deps))
+  for header in new_all_headers:
+    other_mappings = [h.environment.mapping for h in headers_dependencies[header]]
     header.environment.update_with_dependencies(other_mappings)
 
   for submodule in submodules:
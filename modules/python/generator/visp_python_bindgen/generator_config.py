@@ -39,6 +39,8 @@ from pathlib import Path
 from dataclasses import dataclass
 import json
 
+log = logging.getLogger(__name__)
+
 @dataclass
 class ModuleInputData(object):
   name: str
@@ -136,13 +138,17 @@ class GeneratorConfig(object):
     other_args=['--passthru-unfound-includes'] #"--passthru-comments"
   )
 
+  # Use the lightweight preprocessor of fast_preprocessor.py instead of pcpp.
+  # Headers can still be preprocessed with pcpp through the "use_full_preprocessor" header option of the module configuration.
+  fast_preprocess: bool = False
+
   xml_doc_path: Optional[Path] = None
 
   module_data: List[ModuleInputData] = []
 
   @staticmethod
   def _matches_regex_in_list(s: str, regexes: List[str]) -> bool:
-    return any(map(lambda regex: re.match(regex, s) is not None, regexes))
+    return any(re.match(regex, s) is not None for regex in regexes)
 
   @staticmethod
   def is_immutable_type(type: str) -> bool:
@@ -165,7 +171,7 @@ class GeneratorConfig(object):
     assert path.exists(), f'Main config file {path} was not found'
     with open(path, 'r') as main_config_file:
       main_config = json.load(main_config_file)
-      logging.info('Updating the generator config from dict: ', main_config)
+      log.info('Updating the generator config from dict: %s', main_config)
       GeneratorConfig.pcpp_config.include_directories = main_config['include_dirs']
 
       defines = main_config.get('defines')
@@ -173,6 +179,8 @@ class GeneratorConfig(object):
         for define_key in defines:
           GeneratorConfig.pcpp_config.defines[define_key] = defines[define_key]
 
+      GeneratorConfig.fast_preprocess = main_config.get('fast_preprocess', False)
+
       xml_doc_path = main_config.get('xml_doc_path')
       if xml_doc_path is not None:
         GeneratorConfig.xml_doc_path = Path(xml_doc_path)
@@ -180,15 +188,15 @@ class GeneratorConfig(object):
       modules_dict = main_config.get('modules')
       source_dir = Path(main_config.get('source_dir'))
       for module_name in modules_dict:
-        headers = map(lambda s: Path(s), modules_dict[module_name].get('headers'))
+        headers = [Path(s) for s in modules_dict[module_name].get('headers')]
         deps = modules_dict[module_name].get('dependencies')
 
         # Include only headers that are in the VISP source directory
         # Fix: Check specifically in the modules directory,
         # since the build directory (containing vpConfig.h, that we want to ignore)
         # Can be in the src folder
-        headers = list(filter(lambda h: (source_dir / 'modules') in h.parents, headers))
+        headers = [h for h in headers if (source_dir / 'modules') in h.parents]
 
         headers_log_str = '\n\t'.join([str(header) for header in headers])
-        logging.info(f'Module {module_name} headers: \n\t{headers_log_str}')
+        log.info('Module %s headers: \n\t%s', module_name, headers_log_str)
         GeneratorConfig.module_data.append(ModuleInputData(module_name, headers, deps))
@@ -34,13 +34,20 @@
 #############################################################################
 
 
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple, Union
 from pathlib import Path
 from dataclasses import dataclass
 from collections import OrderedDict
+import hashlib
+import io
 import logging
+import os
+import pickle
+import re
+import tempfile
 
 import pcpp
+import cxxheaderparser
 from cxxheaderparser import types
 from cxxheaderparser.simple import parse_string, ParsedData, NamespaceScope, ClassScope
 
@@ -48,7 +55,8 @@ from visp_python_bindgen.utils import *
 from visp_python_bindgen.methods import *
 from visp_python_bindgen.doc_parser import *
 from visp_python_bindgen.header_utils import *
-from visp_python_bindgen.generator_config import GeneratorConfig
+from visp_python_bindgen.generator_config import GeneratorConfig, PreprocessorConfig
+from visp_python_bindgen.fast_preprocessor import fast_preprocess, FastPreprocessorError
 from visp_python_bindgen.template_expansion import expand_templates
 
 
@@ -56,6 +64,167 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
   from submodule import Submodule
 
+log = logging.getLogger(__name__)
+
+# Includes that should be appended at the start of every file
+FORCED_INCLUDES = [
+  'visp3/core/vpConfig.h', # Always include vpConfig: ensure that VISP macros are correctly defined
+]
+
+_GENERATOR_DIGEST: Optional[str] = None
+
+def get_generator_digest() -> str:
+  '''
+  Hash of the sources of the generator, pcpp and cxxheaderparser.
+  It is part of the key of the on disk cache of preprocessed headers: any change to the way headers are preprocessed,
+  parsed or analyzed (e.g., header environments) invalidates the cache.
+  The sources of pcpp and cxxheaderparser are hashed rather than their versions, which do not change
+  between installs from their development branches (cxxheaderparser reports "master").
+  '''
+  global _GENERATOR_DIGEST
+  if _GENERATOR_DIGEST is None:
+    digest = hashlib.blake2b(digest_size=20)
+    for package_dir in [Path(__file__).parent, Path(pcpp.__file__).parent, Path(cxxheaderparser.__file__).parent]:
+      for source_path in sorted(package_dir.rglob('*.py')):
+        digest.update(source_path.relative_to(package_dir.parent).as_posix().encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(source_path.read_bytes())
+        digest.update(b'\0')
+    _GENERATOR_DIGEST = digest.hexdigest()
+  return _GENERATOR_DIGEST
+
+# Digests of the files that preprocessed headers depend on, computed at most once per run
+_FILE_DIGESTS: Dict[Path, Optional[str]] = {}
+
+def get_file_digest(path: Path) -> Optional[str]:
+  '''
+  Hash of the content of a file, or None if it does not exist anymore
+  '''
+  if path not in _FILE_DIGESTS:
+    try:
+      _FILE_DIGESTS[path] = hashlib.blake2b(path.read_bytes(), digest_size=20).hexdigest()
+    except OSError:
+      _FILE_DIGESTS[path] = None
+  return _FILE_DIGESTS[path]
+
+# Lines including a header with angle brackets. They are removed before preprocessing
+# Both regexes are applied to the whole header text at once: [^\S\n] is a whitespace that does not span lines
+INCLUDE_LINE_REGEX = re.compile(r'^[^\S\n]*#[^\S\n]*include[^\S\n]*<.*(?:\n|$)', re.MULTILINE)
+# Defines that could have been left by the preprocessor
+DEFINE_LINE_REGEX = re.compile(r'^#define.*(?:\n|$)', re.MULTILINE)
+
+def run_preprocessor(path: Path, pcpp_config: PreprocessorConfig, forced_includes: List[str], use_fast_preprocessor: bool) -> Tuple[str, List[Path]]:
+  '''
+  Preprocess a header. Returns the preprocessed header and the files that were included by the preprocessor.
+  '''
+  log.info('Preprocessing header %s', path.name)
+
+  # Remove all includes: we only include configuration headers (forced includes)
+  header_content = INCLUDE_LINE_REGEX.sub('', path.read_text(encoding='utf-8'))
+
+  preprocessed_header_content = None
+  if use_fast_preprocessor:
+    try:
+      preprocessed_header_content, included_files = fast_preprocess(header_content, forced_includes, pcpp_config)
+    except FastPreprocessorError as e:
+      log.info('Header %s cannot be handled by the fast preprocessor, using pcpp: %s', path.name, e)
+
+  if preprocessed_header_content is None:
+    preprocessed_header_content, included_files = run_pcpp(path, pcpp_config, forced_includes, header_content)
+
+  # Remove all #defines that could have been left by the preprocessor
+  preprocessed_header_content = DEFINE_LINE_REGEX.sub('', preprocessed_header_content)
+  # Further refine header content: fix some simple parsing bugs
+  preprocessed_header_content = preprocessed_header_content.replace('#include<', '#include <') # Bug in cpp header parser
+  preprocessed_header_content = preprocessed_header_content.replace('inline friend', 'friend inline') # Bug in cpp header parser
+
+  return preprocessed_header_content, included_files
+
+class PcppPreprocessor(pcpp.Preprocessor):
+  '''
+  pcpp preprocessor configured from a PreprocessorConfig, to preprocess strings in memory.
+  It behaves as the pcpp command line (pcpp.CmdPreprocessor) called with the arguments of PreprocessorConfig.to_pcpp_args_list
+  '''
+  def __init__(self, config: PreprocessorConfig):
+    super().__init__()
+    self.line_directive = config.line_directive or None
+    self.passthru_includes = re.compile(config.passthrough_includes_regex)
+    self.passthru_unfound_includes = '--passthru-unfound-includes' in config.other_args
+    self.passthru_comments = '--passthru-comments' in config.other_args
+    self.never_defined = set(config.never_defined)
+    for k, v in config.defines.items():
+      self.define(f'{k} {v if v is not None else "1"}') # -D A is equivalent to -D A=1
+    for include_dir in config.include_directories:
+      self.add_path(include_dir)
+
+  def get_included_files(self) -> List[Path]:
+    '''
+    Files that were opened by this preprocessor, through #include directives
+    '''
+    return [Path(inclusion.included_abspath) for inclusion in self.include_times if inclusion.included_abspath is not None]
+
+  def on_include_not_found(self, is_malformed, is_system_include, curdir, includepath):
+    if self.passthru_unfound_includes:
+      raise pcpp.OutputDirective(pcpp.Action.IgnoreAndPassThrough)
+    return super().on_include_not_found(is_malformed, is_system_include, curdir, includepath)
+
+  def on_directive_handle(self, directive, toks, ifpassthru, precedingtoks):
+    if directive.value in ['define', 'undef'] and toks[0].value in self.never_defined:
+      raise pcpp.OutputDirective(pcpp.Action.IgnoreAndPassThrough)
+    return super().on_directive_handle(directive, toks, ifpassthru, precedingtoks)
+
+  def on_comment(self, tok):
+    if self.passthru_comments:
+      return True
+    return super().on_comment(tok)
+
+# Preprocessed forced includes, per pcpp arguments and forced includes. See get_pcpp_preamble
+_PCPP_PREAMBLES: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], Tuple[Dict[str, pcpp.parser.Macro], str, List[Path]]] = {}
+
+def get_pcpp_preamble(pcpp_config: PreprocessorConfig, forced_includes: List[str]) -> Tuple[Dict[str, pcpp.parser.Macro], str, List[Path]]:
+  '''
+  Preprocess the forced includes, once per process, as a precompiled header would.
+  Returns the macros defined after including them, the resulting output and the files that were included.
+  Headers are then preprocessed starting from these macros, instead of including and tokenizing the forced includes again.
+  '''
+  key = (tuple(pcpp_config.to_pcpp_args_list()), tuple(forced_includes))
+  if key not in _PCPP_PREAMBLES:
+    preprocessor = PcppPreprocessor(pcpp_config)
+    preprocessor.parse(''.join([f'#include <{include}>\n' for include in forced_includes]))
+    output = io.StringIO()
+    preprocessor.write(output)
+    _PCPP_PREAMBLES[key] = (dict(preprocessor.macros), output.getvalue(), preprocessor.get_included_files())
+  return _PCPP_PREAMBLES[key]
+
+def run_pcpp(path: Path, pcpp_config: PreprocessorConfig, forced_includes: List[str], header_content: str) -> Tuple[str, List[Path]]:
+  preamble_macros, preamble_output, preamble_included_files = get_pcpp_preamble(pcpp_config, forced_includes)
+  preprocessor = PcppPreprocessor(pcpp_config)
+  preprocessor.macros.update(preamble_macros)
+  preprocessor.parse(header_content, source=str(path))
+  output = io.StringIO()
+  output.write(preamble_output)
+  preprocessor.write(output)
+  # The header itself is also recorded by pcpp: it is not an included file
+  header_abspath = Path(os.path.abspath(path))
+  included_files = [included_file for included_file in preprocessor.get_included_files() if included_file != header_abspath]
+  return output.getvalue(), sorted(set(preamble_included_files + included_files))
+
+def preprocess_header(path: Path, pcpp_config: PreprocessorConfig, forced_includes: List[str], use_fast_preprocessor: bool) -> Tuple[str, ParsedData, HeaderEnvironment, List[Path]]:
+  '''
+  Run the preprocessor on a header, parse the result and compute the header environment.
+  Everything this function depends on is passed as argument (it does not rely on GeneratorConfig),
+  so that it can be called in a worker process, whatever the multiprocessing start method is.
+  Returns the preprocessed header, its cxxheaderparser representation, its environment and the files included by the preprocessor.
+
+  The environment contains the mapping from partially qualified names to fully qualified names.
+  If a class inherits from another, the environment should be updated with what is contained in the base class environment.
+  This should be done in another step, once all headers are preprocessed
+  '''
+  from cxxheaderparser.options import ParserOptions
+  preprocessed_header_str, included_files = run_preprocessor(path, pcpp_config, forced_includes, use_fast_preprocessor) # Run preprocessor, get only code that can be compiled with current visp
+  header_repr: ParsedData = parse_string(preprocessed_header_str, options=ParserOptions(verbose=False, convert_void_to_zero_params=True)) # Get the cxxheaderparser representation of the header
+  return preprocessed_header_str, header_repr, HeaderEnvironment(header_repr), included_files
+
 class HeaderFile():
   def __init__(self, path: Path, submodule: 'Submodule'):
     self.path = path
@@ -66,59 +235,80 @@ class HeaderFile():
     self.contains = []
     self.depends = []
     self.documentation_holder_path: Path = None
-    self.documentation_holder = None
+    self._documentation_holder: Optional[DocumentationHolder] = None
     self.environment: HeaderEnvironment = None
 
+  @property
+  def documentation_holder(self) -> Optional[DocumentationHolder]:
+    '''
+    Documentation of this header, if available.
+    The XML documentation is only parsed when it is first requested: it is never parsed if all the classes of the header are ignored.
+    '''
+    if self._documentation_holder is None and self.documentation_holder_path is not None:
+      self._documentation_holder = DocumentationHolder(self.documentation_holder_path, self.environment.mapping)
+    return self._documentation_holder
+
   def __getstate__(self):
     return self.__dict__
   def __setstate__(self, d):
     self.__dict__ = d
 
-  def get_header_dependencies(self, headers: List['HeaderFile']) -> List['HeaderFile']:
-    if len(self.depends) == 0:
+  def get_additional_dependency_names(self) -> List[str]:
+    '''
+    Names of the headers that this header depends on, as declared by the user in the module configuration (header_additional_dependencies)
+    '''
+    all_user_required_header_names = self.submodule.config.get('header_additional_dependencies')
+    if all_user_required_header_names is None:
       return []
+    return all_user_required_header_names.get(self.path.name, [])
 
-    user_required_headers = []
-    all_user_required_header_names = self.submodule.config.get('header_additional_dependencies')
-    if all_user_required_header_names is not None:
-      user_required_headers = all_user_required_header_names.get(self.path.name, [])
+  def get_preprocessing_args(self) -> Tuple[Path, PreprocessorConfig, List[str], bool]:
+    '''
+    Arguments of preprocess_header for this header.
+    Headers are preprocessed by calling preprocess_header on these arguments, possibly in a worker process,
+    and by giving the result back to set_preprocessing_result.
+    '''
+    return self.path, GeneratorConfig.pcpp_config, FORCED_INCLUDES, self.use_fast_preprocessor()
 
-    header_deps = []
-    for header in headers:
-      if header == self:
-        continue
-      is_dependency = False
-      if header.path.name in user_required_headers:
-        is_dependency = True
-      else:
-        for d in self.depends:
-          if d in header.contains:
-            is_dependency = True
-            break
-      if is_dependency:
-        header_deps.append(header)
-        upper_dependencies = header.get_header_dependencies(headers)
-        header_deps.extend(upper_dependencies)
-    return header_deps
-
-  def preprocess(self) -> None:
+  def use_fast_preprocessor(self) -> bool:
     '''
-    Preprocess the header to obtain the abstract representation of the cpp classes available.
-    Additionally get the path to the xml documentation file generated by doxygen
+    Whether to use the fast preprocessor instead of pcpp. Headers that require it can force the use of pcpp in the module configuration.
     '''
-    from cxxheaderparser.options import ParserOptions
-    self.preprocessed_header_str = self.run_preprocessor() # Run preprocessor, get only code that can be compiled with current visp
+    return GeneratorConfig.fast_preprocess and not self.submodule.get_header_config(self.path.name)['use_full_preprocessor']
 
-    self.header_repr: ParsedData = parse_string(self.preprocessed_header_str, options=ParserOptions(verbose=False, convert_void_to_zero_params=True)) # Get the cxxheaderparser representation of the header
+  def load_cached_preprocessing_result(self) -> bool:
+    '''
+    Set the preprocessing result of this header from the on disk cache.
+    Returns False if there is no valid cache entry for the header, in which case the header should be preprocessed.
+    '''
+    cached_data = self._load_cached_ast(self._get_ast_cache_path())
+    if cached_data is None:
+      return False
+    self._update_from_header_repr(*cached_data)
+    return True
+
+  def set_preprocessing_result(self, preprocessed_header_str: str, header_repr: ParsedData, environment: HeaderEnvironment, included_files: List[Path]) -> None:
+    '''
+    Set the result of preprocess_header for this header, and save it to the on disk cache.
+    '''
+    self._update_from_header_repr(preprocessed_header_str, header_repr, environment)
+    self._save_cached_ast(self._get_ast_cache_path(), included_files)
+
+  def _update_from_header_repr(self, preprocessed_header_str: str, header_repr: ParsedData, environment: HeaderEnvironment) -> None:
+    self.preprocessed_header_str = preprocessed_header_str
+    self.header_repr = header_repr
+    self.environment = environment
+    self.contains = []
+    self.depends = []
 
     # Get dependencies of this header. This is important for the code generation order
     for cls in self.header_repr.namespace.classes:
-      name_cpp_no_template = '::'.join([seg.name for seg in cls.class_decl.typename.segments])
+      name_cpp_no_template = get_name(cls.class_decl.typename)
       self.contains.append(name_cpp_no_template)
 
       # Add parent classes as dependencies
       for base_class in cls.class_decl.bases:
-        base_class_str_no_template = '::'.join([segment.name for segment in base_class.typename.segments])
+        base_class_str_no_template = get_name(base_class.typename)
         if base_class_str_no_template.startswith('vp'):
             self.depends.append(base_class_str_no_template)
 
@@ -126,82 +316,84 @@ class HeaderFile():
       if self.documentation_holder_path is None:
         self.documentation_holder_path = DocumentationData.get_xml_path_if_exists(name_cpp_no_template, DocumentationObjectKind.Class)
 
-  def run_preprocessor(self):
-    logging.info(f'Preprocessing header {self.path.name}')
-    tmp_dir = self.submodule.submodule_file_path.parent / "tmp"
+  def _get_tmp_dir(self) -> Path:
+    tmp_dir = self.submodule.submodule_file_path.parent / 'tmp'
     tmp_dir.mkdir(exist_ok=True)
-    tmp_file_path = tmp_dir / (self.path.name + '.in')
-    preprocessor_output_path = tmp_dir / (self.path.name)
-    tmp_file_content = []
-
-    # Includes that should be appended at the start of every file
-    forced_includes = [
-      'visp3/core/vpConfig.h', # Always include vpConfig: ensure that VISP macros are correctly defined
-    ]
-    for include in forced_includes:
-      tmp_file_content.append(f'#include <{include}>\n')
-
-    # Remove all includes: we only include configuration headers, defined above
-    with open(self.path.absolute(), 'r', encoding='utf-8') as input_header_file:
-      include_regex = '#include\s*<(.*)>'
-      for line in input_header_file.readlines():
-        matches = re.search(include_regex, line)
-        if matches is None: # Include line if its not an include
-          tmp_file_content.append(line)
-        # else:
-          # if 'visp3' in matches.group() or 'opencv' in matches.group():
-          #   tmp_file_content.append(line)
-
-    with open(tmp_file_path.absolute(), 'w', encoding='utf-8') as tmp_file:
-      tmp_file.write(''.join(tmp_file_content))
-      tmp_file.flush()
-
-
-    argv = [''] + GeneratorConfig.pcpp_config.to_pcpp_args_list()
-    argv += ['-o', f'{preprocessor_output_path}', str(tmp_file_path.absolute())]
-    argv_str = ", ".join(argv)
-    logging.info(f'Preprocessor arguments:\n{argv_str}')
-
-    pcpp.CmdPreprocessor(argv)
-    preprocessed_header_content = None
-
-    # Remove all #defines that could have been left by the preprocessor
-    with open(preprocessor_output_path, 'r', encoding='utf-8') as header_file:
-      preprocessed_header_lines = []
-      for line in header_file.readlines():
-        if not line.startswith('#define'):
-          preprocessed_header_lines.append(line)
-      preprocessed_header_content = ''.join(preprocessed_header_lines)
-      # Further refine header content: fix some simple parsing bugs
-      preprocessed_header_content = preprocessed_header_content.replace('#include<', '#include <') # Bug in cpp header parser
-      preprocessed_header_content = preprocessed_header_content.replace('inline friend', 'friend inline') # Bug in cpp header parser
-
-    return preprocessed_header_content
+    return tmp_dir
 
-  def generate_binding_code(self, bindings_container: BindingsContainer) -> None:
-    assert self.header_repr is not None, 'The header was not preprocessed before calling the generation step!'
-    self.parse_data(bindings_container)
+  def _get_ast_cache_path(self) -> Path:
+    '''
+    There is a single cache entry per header, which is overwritten when the header is preprocessed again:
+    the cache does not grow with outdated entries.
+    '''
+    path_hash = hashlib.blake2b(str(self.path.absolute()).encode('utf-8'), digest_size=20).hexdigest()
+    return self._get_tmp_dir() / 'ast_cache' / f'{path_hash}.pkl'
 
-  def compute_environment(self):
+  def _cache_key(self) -> str:
     '''
-    Compute the header environment
-    This environment contains:
-      - The mapping from partially qualified names to fully qualified names
-    If a class inherits from another, the environment should be updated with what is contained in the base class environment.
-    This should be done in another step
+    Hash of what the result of the preprocessing and parsing steps depends on, apart from the included files:
+    the header content, the forced includes, the preprocessor used and its arguments,
+    the sources of the generator and the versions of pcpp and cxxheaderparser.
+    The files included by the preprocessor are checked separately, see _load_cached_ast.
     '''
-    self.environment = HeaderEnvironment(self.header_repr)
+    key = hashlib.blake2b(digest_size=20)
+    def add(data: bytes) -> None:
+      key.update(data)
+      key.update(b'\0') # Separator, so that consecutive fields cannot be confused
+
+    add(self.path.read_bytes())
+    for include in FORCED_INCLUDES:
+      add(include.encode('utf-8'))
+    for arg in GeneratorConfig.pcpp_config.to_pcpp_args_list():
+      add(arg.encode('utf-8'))
+    add(b'fast' if self.use_fast_preprocessor() else b'pcpp')
+    add(get_generator_digest().encode('utf-8'))
+    return key.hexdigest()
+
+  def _load_cached_ast(self, cache_path: Path) -> Optional[Tuple[str, ParsedData, HeaderEnvironment]]:
+    if not cache_path.exists():
+      return None
+    try:
+      with open(cache_path, 'rb') as cache_file:
+        cache_key, included_files_digests, preprocessed_header_str, header_repr, environment = pickle.load(cache_file)
+    except Exception as e: # Corrupted or incompatible cache entry: preprocess the header again
+      log.warning('Could not load cached representation of header %s from %s: %s', self.path.name, cache_path, e)
+      return None
+    if cache_key != self._cache_key():
+      return None
+    for included_file, digest in included_files_digests:
+      if get_file_digest(included_file) != digest:
+        log.info('Cached representation of header %s is outdated: %s changed', self.path.name, included_file)
+        return None
+    log.info('Using cached representation of header %s', self.path.name)
+    return preprocessed_header_str, header_repr, environment
+
+  def _save_cached_ast(self, cache_path: Path, included_files: List[Path]) -> None:
+    included_files_digests = [(included_file, get_file_digest(included_file)) for included_file in included_files]
+    cache_path.parent.mkdir(exist_ok=True)
+    # Write to a temporary file and rename it: a concurrent or interrupted run never sees a partially written entry
+    fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+    try:
+      with os.fdopen(fd, 'wb') as cache_file:
+        cache_data = (self._cache_key(), included_files_digests, self.preprocessed_header_str, self.header_repr, self.environment)
+        pickle.dump(cache_data, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+      os.replace(tmp_path, cache_path)
+    except Exception:
+      os.unlink(tmp_path)
+      raise
+
+  def generate_binding_code(self, bindings_container: BindingsContainer) -> None:
+    assert self.header_repr is not None, 'The header was not preprocessed before calling the generation step!'
+    self.parse_data(bindings_container)
 
   def parse_data(self, bindings_container: BindingsContainer) -> None:
     '''
     Update the bindings container passed in parameter with the bindings linked to this header file
     '''
     from visp_python_bindgen.enum_binding import get_enum_bindings
-    # Fetch documentation if available
-    if self.documentation_holder_path is not None:
-      self.documentation_holder = DocumentationHolder(self.documentation_holder_path, self.environment.mapping)
-    else:
-      logging.warning(f'No documentation found for header {self.path}')
+    # Documentation is fetched when needed, see documentation_holder
+    if self.documentation_holder_path is None:
+      log.warning('No documentation found for header %s', self.path)
 
     for cls in self.header_repr.namespace.classes:
       self.generate_class(bindings_container, cls, self.environment)
@@ -216,32 +408,38 @@ class HeaderFile():
     '''
     Parse a subnamespace and all its subnamespaces.
     In a namespace, only the functions are exported.
+    Namespaces are visited depth first, in declaration order.
     '''
+    namespaces_to_parse = [(ns, namespace_prefix, is_root)]
+    while len(namespaces_to_parse) > 0:
+      ns, namespace_prefix, is_root = namespaces_to_parse.pop()
+      if not is_root:
+        log.info('Parsing subnamespace %s', namespace_prefix[:-len('::')])
+      if not is_root and ns.name == '': # Anonymous namespace, only visible in header, so we ignore it
+        continue
 
-    if not is_root and ns.name == '': # Anonymous namespace, only visible in header, so we ignore it
-      return
-
-    functions_with_configs, rejected_functions = get_bindable_functions_with_config(self.submodule, ns.functions, self.environment.mapping)
+      functions_with_configs, rejected_functions = get_bindable_functions_with_config(self.submodule, ns.functions, self.environment.mapping)
 
-    # Log rejected functions
-    rejection_strs = []
-    for rejected_function in rejected_functions:
-      self.submodule.report.add_non_generated_method(rejected_function)
-      if NotGeneratedReason.is_non_trivial_reason(rejected_function.rejection_reason):
-        rejection_strs.append(f'\t{rejected_function.signature} was rejected! Reason: {rejected_function.rejection_reason}')
-    if len(rejection_strs) > 0:
-      logging.warning(f'Rejected function in namespace: {ns.name}')
-      logging.warning('\n' + '\n'.join(rejection_strs))
+      # Log rejected functions
+      log_rejections = log.isEnabledFor(logging.WARNING)
+      rejection_strs = []
+      for rejected_function in rejected_functions:
+        self.submodule.report.add_non_generated_method(rejected_function)
+        if log_rejections and NotGeneratedReason.is_non_trivial_reason(rejected_function.rejection_reason):
+          rejection_strs.append(f'\t{rejected_function.signature} was rejected! Reason: {rejected_function.rejection_reason}')
+      if len(rejection_strs) > 0:
+        log.warning('Rejected function in namespace: %s', ns.name)
+        log.warning('\n%s', '\n'.join(rejection_strs))
 
-    bound_object = BoundObjectNames('submodule', self.submodule.name, namespace_prefix, namespace_prefix)
-    defs = []
-    for function, function_config in functions_with_configs:
-      defs.append(define_method(function, function_config, False, {}, self, self.environment, bound_object)[0])
+      bound_object = BoundObjectNames('submodule', self.submodule.name, namespace_prefix, namespace_prefix)
+      defs = []
+      for function, function_config in functions_with_configs:
+        defs.append(define_method(function, function_config, False, {}, self, self.environment, bound_object)[0])
 
-    bindings_container.add_bindings(SingleObjectBindings(bound_object, None, defs, GenerationObjectType.Namespace))
-    for sub_ns in ns.namespaces:
-      logging.info(f'Parsing subnamespace {namespace_prefix + sub_ns}')
-      self.parse_sub_namespace(bindings_container, ns.namespaces[sub_ns], namespace_prefix + sub_ns + '::', False)
+      bindings_container.add_bindings(SingleObjectBindings(bound_object, None, defs, GenerationObjectType.Namespace))
+      # Pushed in reverse order, so that subnamespaces are popped in declaration order
+      for sub_ns in reversed(list(ns.namespaces.keys())):
+        namespaces_to_parse.append((ns.namespaces[sub_ns], namespace_prefix + sub_ns + '::', False))
 
   def generate_class(self, bindings_container: BindingsContainer, cls: ClassScope, header_env_base: HeaderEnvironment, owner='submodule') -> None:
     '''
@@ -252,6 +450,13 @@ class HeaderFile():
     If it is templated, the mapping (template argument types => Python class name) must be provided in the JSON config file
     Subclasses are also generated
     '''
+    name_cpp_no_template = get_name(cls.class_decl.typename)
+    log.info('Parsing class "%s"', name_cpp_no_template)
+
+    # Check this first: nothing should be done for ignored classes
+    if self.submodule.class_should_be_ignored(name_cpp_no_template):
+      return
+
     def generate_class_with_potiental_specialization(name_python: str, owner_specs: 'OrderedDict[str, str]', cls_config: Dict, header_env: HeaderEnvironment) -> None:
       '''
       Generate the bindings of a single class, handling a potential template specialization.
@@ -271,16 +476,38 @@ class HeaderFile():
         else:
           methods_dict[key].append(value)
 
-      def add_method_doc_to_pyargs(method: types.Method, py_arg_strs: List[str]) -> List[str]:
+      # The same parsed types are resolved several times (documentation lookup, parameters, overloads): memoize their string representation
+      # Parsed types live as long as the header representation, so their id is a valid key during class generation
+      type_cache: Dict[Tuple[int, Tuple[Tuple[str, str], ...], int], Optional[str]] = {}
+      def get_type_cached(type_obj: Union[types.FunctionType, types.DecoratedType, types.Value], specs: Dict[str, str]) -> Optional[str]:
+        key = (id(type_obj), tuple(specs.items()), id(header_env.mapping))
+        if key not in type_cache:
+          type_cache[key] = get_type(type_obj, specs, header_env.mapping)
+        return type_cache[key]
+
+      def get_method_types(method: types.Method) -> Tuple[Optional[str], List[Optional[str]], Optional[str], List[Optional[str]]]:
+        '''
+        Resolve the return and parameter types of a method, with the template specializations of the class and without them.
+        Types without specializations are used to match with doc. When the class is not templated, they are only resolved once.
+        '''
+        return_type_str = get_type_cached(method.return_type, owner_specs)
+        params_strs = [get_type_cached(param.type, owner_specs) for param in method.parameters]
+        if len(owner_specs) == 0:
+          return return_type_str, params_strs, return_type_str, params_strs
+        doc_return_type_str = get_type_cached(method.return_type, {})
+        doc_params_strs = [get_type_cached(param.type, {}) for param in method.parameters]
+        return return_type_str, params_strs, doc_return_type_str, doc_params_strs
+
+      def add_method_doc_to_pyargs(method: types.Method, py_arg_strs: List[str], doc_return_type_str: Optional[str], doc_params_strs: List[Optional[str]]) -> List[str]:
         if self.documentation_holder is not None:
           method_name = get_name(method.name)
           method_doc_signature = MethodDocSignature(method_name,
-                                                    get_type(method.return_type, {}, header_env.mapping) or '', # Don't use specializations so that we can match with doc
-                                                    [get_type(param.type, {}, header_env.mapping) for param in method.parameters],
+                                                    doc_return_type_str or '', # Don't use specializations so that we can match with doc
+                                                    doc_params_strs,
                                                     method.const, method.static)
           method_doc = self.documentation_holder.get_documentation_for_method(name_cpp_no_template, method_doc_signature, {}, owner_specs, param_names, [])
           if method_doc is None:
-            logging.warning(f'Could not find documentation for {name_cpp}::{method_name}!')
+            log.warning('Could not find documentation for %s::%s!', name_cpp, method_name)
             return py_arg_strs
           else:
             return [method_doc.documentation] + py_arg_strs
@@ -290,7 +517,7 @@ class HeaderFile():
       if self.documentation_holder is not None:
         class_doc = self.documentation_holder.get_documentation_for_class(name_cpp_no_template, {}, owner_specs)
       else:
-        logging.warning(f'Documentation not found when looking up {name_cpp_no_template}')
+        log.warning('Documentation not found when looking up %s', name_cpp_no_template)
 
       # Declaration
       # Add template specializations to cpp class name. e.g., vpArray2D becomes vpArray2D<double> if the template T is double
@@ -299,7 +526,7 @@ class HeaderFile():
       template_strs = None
       if template_decl is not None:
         template_strs = []
-        template_strs = map(lambda t: owner_specs[t.name], template_decl.params)
+        template_strs = [owner_specs[t.name] for t in template_decl.params]
         template_str = f'<{", ".join(template_strs)}>'
         name_cpp += template_str
 
@@ -311,8 +538,8 @@ class HeaderFile():
 
 
       # Reference public base classes when creating pybind class binding
-      base_class_strs = list(map(lambda base_class: get_typename(base_class.typename, owner_specs, header_env.mapping),
-                            filter(lambda b: b.access == 'public', cls.class_decl.bases)))
+      base_class_strs = [get_typename(base_class.typename, owner_specs, header_env.mapping)
+                         for base_class in cls.class_decl.bases if base_class.access == 'public']
 
       # Add trampoline class if defined
       # Trampoline classes allow classes defined in Python to override virtual methods declared in C++
@@ -348,32 +575,32 @@ class HeaderFile():
       bindable_methods_and_config, rejected_methods = get_bindable_methods_with_config(self.submodule, cls.methods,
                                                                                     name_cpp_no_template, owner_specs, header_env_base.mapping)
       # Display rejected methods
+      log_rejections = log.isEnabledFor(logging.WARNING)
       rejection_strs = []
       for rejected_method in rejected_methods:
         self.submodule.report.add_non_generated_method(rejected_method)
-        if NotGeneratedReason.is_non_trivial_reason(rejected_method.rejection_reason):
+        if log_rejections and NotGeneratedReason.is_non_trivial_reason(rejected_method.rejection_reason):
           rejection_strs.append(f'\t{rejected_method.signature} was rejected! Reason: {rejected_method.rejection_reason}')
       if len(rejection_strs) > 0:
-        logging.warning(f'Rejected method in class: {name_cpp}')
-        logging.warning('\n'.join(rejection_strs))
+        log.warning('Rejected method in class: %s', name_cpp)
+        log.warning('%s', '\n'.join(rejection_strs))
 
       # Split between constructors and other methods
       constructors, non_constructors = split_methods_with_config(bindable_methods_and_config, lambda m: m.constructor)
 
       # Split between "normal" methods and operators, which require a specific definition
-      cpp_operator_names = cpp_operator_list()
-      operators, basic_methods = split_methods_with_config(non_constructors, lambda m: get_name(m.name) in cpp_operator_names)
+      operators, basic_methods = split_methods_with_config(non_constructors, lambda m: get_name(m.name) in CPP_OPERATOR_NAMES)
 
       # Constructors definitions
       if not contains_pure_virtual_methods or trampoline_name is not None:
         for method, method_config in constructors:
           method_name = get_name(method.name)
-          params_strs = [get_type(param.type, owner_specs, header_env.mapping) for param in method.parameters]
+          _, params_strs, doc_return_type_str, doc_params_strs = get_method_types(method)
           py_arg_strs = get_py_args(method.parameters, owner_specs, header_env.mapping)
 
           param_names = [param.name or 'arg' + str(i) for i, param in enumerate(method.parameters)]
 
-          py_arg_strs = add_method_doc_to_pyargs(method, py_arg_strs)
+          py_arg_strs = add_method_doc_to_pyargs(method, py_arg_strs, doc_return_type_str, doc_params_strs)
 
           ctor_str = f'''{python_ident}.{define_constructor(params_strs, py_arg_strs)};'''
 
@@ -385,55 +612,54 @@ class HeaderFile():
       for method, method_config in operators:
         method_name = get_name(method.name)
         method_is_const = method.const
-        params_strs = [get_type(param.type, owner_specs, header_env.mapping) for param in method.parameters]
-        return_type_str = get_type(method.return_type, owner_specs, header_env.mapping)
+        return_type_str, params_strs, doc_return_type_str, doc_params_strs = get_method_types(method)
         py_args = get_py_args(method.parameters, owner_specs, header_env.mapping)
         py_args = py_args + ['py::is_operator()']
         param_names = [param.name or 'arg' + str(i) for i, param in enumerate(method.parameters)]
-        py_args = add_method_doc_to_pyargs(method, py_args)
+        py_args = add_method_doc_to_pyargs(method, py_args, doc_return_type_str, doc_params_strs)
 
         # if len(params_strs) > 1:
-        #   logging.info(f'Found operator {name_cpp}{method_name} with more than one parameter, skipping')
+        #   log.info('Found operator %s%s with more than one parameter, skipping', name_cpp, method_name)
         #   rejection_param_strs = [get_type(param.type, {}, header_env.mapping) for param in method.parameters]
         #   rejection_return_type_str = get_type(method.return_type, {}, header_env.mapping)
         #   rejection = RejectedMethod(name_cpp, method, method_config, get_method_signature(method_name, rejection_return_type_str, rejection_param_strs), NotGeneratedReason.NotHandled)
         #   self.submodule.report.add_non_generated_method(rejection)
         #   continue
         if len(params_strs) < 1: # Unary ops
-          for cpp_op, python_op_name in supported_const_return_unary_op_map().items():
-            if method_name == f'operator{cpp_op}':
-              operator_str = lambda_const_return_unary_op(python_ident, python_op_name, cpp_op,
-                                                         method_is_const, name_cpp,
-                                                         return_type_str, py_args)
-              add_to_method_dict(f'__{python_op_name}__', MethodBinding(operator_str, is_static=False, is_lambda=True,
-                                                       is_operator=True, is_constructor=False))
-              break
+          unary_op = CONST_RETURN_UNARY_OPERATORS.get(method_name)
+          if unary_op is not None:
+            cpp_op, python_op_name = unary_op
+            operator_str = lambda_const_return_unary_op(python_ident, python_op_name, cpp_op,
+                                                       method_is_const, name_cpp,
+                                                       return_type_str, py_args)
+            add_to_method_dict(f'__{python_op_name}__', MethodBinding(operator_str, is_static=False, is_lambda=True,
+                                                     is_operator=True, is_constructor=False))
         elif len(params_strs) == 1: # e.g., self + other
-          for cpp_op, python_op_name in supported_const_return_binary_op_map().items():
-            if method_name == f'operator{cpp_op}':
-              operator_str = lambda_const_return_binary_op(python_ident, python_op_name, cpp_op,
-                                                          method_is_const, name_cpp, params_strs[0],
-                                                          return_type_str, py_args)
-              add_to_method_dict(f'__{python_op_name}__', MethodBinding(operator_str, is_static=False, is_lambda=True,
-                                                        is_operator=True, is_constructor=False))
-              break
-          for cpp_op, python_op_name in supported_in_place_binary_op_map().items():
-            if method_name == f'operator{cpp_op}':
-              operator_str = lambda_in_place_binary_op(python_ident, python_op_name, cpp_op,
-                                                      method_is_const, name_cpp, params_strs[0],
-                                                      return_type_str, py_args)
-              add_to_method_dict(f'__{python_op_name}__', MethodBinding(operator_str, is_static=False, is_lambda=True,
-                                                        is_operator=True, is_constructor=False))
-              break
-        else: # N-ary operators
-          for cpp_op, python_op_name in supported_nary_op_map().items():
-            if method_name == f'operator{cpp_op}':
-              operator_str = lambda_nary_op(python_ident, python_op_name, cpp_op,
-                                                    method_is_const, name_cpp, params_strs,
+          binary_op = CONST_RETURN_BINARY_OPERATORS.get(method_name)
+          if binary_op is not None:
+            cpp_op, python_op_name = binary_op
+            operator_str = lambda_const_return_binary_op(python_ident, python_op_name, cpp_op,
+                                                        method_is_const, name_cpp, params_strs[0],
+                                                        return_type_str, py_args)
+            add_to_method_dict(f'__{python_op_name}__', MethodBinding(operator_str, is_static=False, is_lambda=True,
+                                                      is_operator=True, is_constructor=False))
+          in_place_op = IN_PLACE_BINARY_OPERATORS.get(method_name)
+          if in_place_op is not None:
+            cpp_op, python_op_name = in_place_op
+            operator_str = lambda_in_place_binary_op(python_ident, python_op_name, cpp_op,
+                                                    method_is_const, name_cpp, params_strs[0],
                                                     return_type_str, py_args)
-              add_to_method_dict(f'__{python_op_name}__', MethodBinding(operator_str, is_static=False, is_lambda=True,
-                                                        is_operator=True, is_constructor=False))
-              break
+            add_to_method_dict(f'__{python_op_name}__', MethodBinding(operator_str, is_static=False, is_lambda=True,
+                                                      is_operator=True, is_constructor=False))
+        else: # N-ary operators
+          nary_op = NARY_OPERATORS.get(method_name)
+          if nary_op is not None:
+            cpp_op, python_op_name = nary_op
+            operator_str = lambda_nary_op(python_ident, python_op_name, cpp_op,
+                                                  method_is_const, name_cpp, params_strs,
+                                                  return_type_str, py_args)
+            add_to_method_dict(f'__{python_op_name}__', MethodBinding(operator_str, is_static=False, is_lambda=True,
+                                                      is_operator=True, is_constructor=False))
 
       # Define classical methods
       class_def_names = BoundObjectNames(python_ident, name_python, name_cpp_no_template, name_cpp)
@@ -472,7 +698,7 @@ class HeaderFile():
       # from visp.core import B
       # b = B()
       # b.foo(0) # no overload known with int
-      base_bindings = list(filter(lambda b: b is not None, map(lambda s: bindings_container.find_bindings(s), base_class_strs)))
+      base_bindings = [b for b in (bindings_container.find_bindings(s) for s in base_class_strs) if b is not None]
 
       # assert not any(map(lambda b: b is None, base_bindings)), f'Could not retrieve the bindings for a base class of {name_cpp}'
       for base_binding_container in base_bindings:
@@ -480,12 +706,11 @@ class HeaderFile():
         if not isinstance(base_defs, ClassBindingDefinitions):
           raise RuntimeError
         base_methods_dict = base_defs.methods
-        for method_name in methods_dict.keys():
-          if method_name == '__init__': # Do not bring constructors of the base class in this class defs as it makes no sense
-            continue
-          if method_name in base_methods_dict:
-            for parent_method_binding in base_methods_dict[method_name]:
-              methods_dict[method_name].append(parent_method_binding.get_definition_in_child_class(python_ident))
+        # Do not bring constructors of the base class in this class defs as it makes no sense
+        shadowed_method_names = (methods_dict.keys() & base_methods_dict.keys()) - {'__init__'}
+        for method_name in shadowed_method_names:
+          methods_dict[method_name].extend([parent_method_binding.get_definition_in_child_class(python_ident)
+                                            for parent_method_binding in base_methods_dict[method_name]])
 
       # Add to string representation
       if not cls_config['ignore_repr']:
@@ -510,8 +735,8 @@ class HeaderFile():
       # Check for potential error-generating definitions
       error_generating_overloads = get_static_and_instance_overloads(generated_methods)
       if len(error_generating_overloads) > 0:
-        logging.error(f'Overloads defined for instance and class, this will generate a pybind error')
-        logging.error(error_generating_overloads)
+        log.error('Overloads defined for instance and class, this will generate a pybind error')
+        log.error(error_generating_overloads)
         raise RuntimeError('Error generating overloads:\n' + '\n'.join(error_generating_overloads))
 
       # Generate members
@@ -521,27 +746,26 @@ class HeaderFile():
       use_publicist = cls_config['use_publicist']
       publicist_name = f'Publicist{name_python}'
       publicist_str = None
-      if use_publicist:
-        publicist_str = f'class {publicist_name}: public {name_cpp} {{\n'
-        publicist_str += 'public:\n'
+      # Lines of the publicist class definition, joined once all fields are known
+      publicist_lines = [f'class {publicist_name}: public {name_cpp} {{\n', 'public:\n'] if use_publicist else None
 
 
       field_dict = {}
       for field in cls.fields:
         if field.name in cls_config['ignored_attributes']:
-          logging.info(f'Ignoring field in class/struct {name_cpp}: {field.name}')
+          log.info('Ignoring field in class/struct %s: %s', name_cpp, field.name)
           continue
         if field.access == 'public' or (field.access == 'protected' and use_publicist):
           if is_unsupported_argument_type(field.type):
             continue
 
-          field_type = get_type(field.type, owner_specs, header_env.mapping)
+          field_type = get_type_cached(field.type, owner_specs)
           field_name_python = field.name
           prefix_member = 'm_'
           if field_name_python.startswith(prefix_member):
             field_name_python = field_name_python[len(prefix_member):]
 
-          logging.info(f'Found field in class/struct {name_cpp}: {field_type} {field.name}')
+          log.info('Found field in class/struct %s: %s %s', name_cpp, field_type, field.name)
 
           def_str = 'def_'
           def_str += 'readonly' if (field.type.const or field.constexpr) else 'readwrite'
@@ -551,13 +775,14 @@ class HeaderFile():
           field_exposing_class = name_cpp if field.access == 'public' else publicist_name
 
           if field.access == 'protected':
-            publicist_str += f'\tusing {name_cpp}::{field.name};\n'
+            publicist_lines.append(f'\tusing {name_cpp}::{field.name};\n')
 
           field_str = f'{python_ident}.{def_str}("{field_name_python}", &{field_exposing_class}::{field.name});'
           field_dict[field_name_python] = field_str
 
       if use_publicist:
-        publicist_str += '};'
+        publicist_lines.append('};')
+        publicist_str = ''.join(publicist_lines)
       classs_binding_defs = ClassBindingDefinitions(field_dict, methods_dict, publicist_str)
       bindings_container.add_bindings(SingleObjectBindings(class_def_names, class_decl, classs_binding_defs, GenerationObjectType.Class))
 
@@ -565,23 +790,17 @@ class HeaderFile():
         if subclass.class_decl.access != 'public':
           continue
         if name_is_anonymous(subclass.class_decl.typename):
-          logging.warning(f'Class {name_cpp} has a subclass that is hidden behind a typedef that was not generated!')
+          log.warning('Class %s has a subclass that is hidden behind a typedef that was not generated!', name_cpp)
           continue
         self.generate_class(bindings_container, subclass, header_env, owner=python_ident)
 
 
-    name_cpp_no_template = get_name(cls.class_decl.typename)
-    logging.info(f'Parsing class "{name_cpp_no_template}"')
-
-    if self.submodule.class_should_be_ignored(name_cpp_no_template):
-      return
-
     cls_config = self.submodule.get_class_config(name_cpp_no_template)
 
     # Warning for potential double frees
     acknowledged_pointer_fields = cls_config.get('acknowledge_pointer_or_ref_fields') or []
-    refs_or_ptr_fields = list(map(lambda field: get_type(field.type, {}, header_env_base.mapping), filter(lambda field: isinstance(field.type, types.Pointer) or isinstance(field.type, types.Reference),
-                                    cls.fields)))
+    refs_or_ptr_fields = [get_type(field.type, {}, header_env_base.mapping) for field in cls.fields
+                          if isinstance(field.type, types.Pointer) or isinstance(field.type, types.Reference)]
 
     # If some pointer or refs are not acknowledged as existing by user, emit a warning
     if len(set(refs_or_ptr_fields).difference(set(acknowledged_pointer_fields))) > 0:
@@ -592,7 +811,7 @@ class HeaderFile():
       generate_class_with_potiental_specialization(name_python, {}, cls_config, header_env_base)
     else:
       if cls_config is None or 'specializations' not in cls_config or len(cls_config['specializations']) == 0:
-        logging.warning(f'Could not find template specialization for class {name_cpp_no_template}: skipping!')
+        log.warning('Could not find template specialization for class %s: skipping!', name_cpp_no_template)
         self.submodule.report.add_non_generated_class(name_cpp_no_template, cls_config, 'Skipped because there was no declared specializations')
       else:
         specs = cls_config['specializations']
@@ -49,6 +49,8 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
   from visp_python_bindgen.header import HeaderFile
 
+log = logging.getLogger(__name__)
+
 def sort_headers(headers: List['HeaderFile']) -> List['HeaderFile']:
   '''
   Sort headers based on their dependencies on other classes.
@@ -66,7 +68,7 @@ def sort_headers(headers: List['HeaderFile']) -> List['HeaderFile']:
       include_in_result_fn = lambda h: len(h.depends) == 0
     else:
       # Some header define multiple classes, where one may rely on another. So we filter h.depends
-      include_in_result_fn = lambda h: all(map(lambda x: x in dependencies, filter(lambda s: s not in h.contains, h.depends)))
+      include_in_result_fn = lambda h: all(x in dependencies for x in h.depends if x not in h.contains)
     new_remainder = []
     new_dependencies = dependencies.copy()
     for header_file in remainder:
@@ -80,7 +82,7 @@ def sort_headers(headers: List['HeaderFile']) -> List['HeaderFile']:
       warning_msg = f'''
       Warning: Could not completely solve dependencies, generating but might have some errors
       Faulty headers: {[h.path.name for h in remainder]}'''
-      logging.warning(warning_msg)
+      log.warning(warning_msg)
       print(warning_msg, file=sys.stderr)
       result.extend(remainder)
     else:
@@ -89,6 +91,47 @@ def sort_headers(headers: List['HeaderFile']) -> List['HeaderFile']:
   add_level(result, headers, set())
   return result
 
+def get_headers_dependencies(headers: List['HeaderFile']) -> Dict['HeaderFile', List['HeaderFile']]:
+  '''
+  Compute, for each header, the list of headers that it depends on, directly or not.
+  A header depends on the headers that contain its base classes and on those listed in the module configuration (header_additional_dependencies).
+  Dependencies are listed in depth-first order: a direct dependency is followed by its own dependencies.
+  '''
+  header_order = {header: i for i, header in enumerate(headers)}
+  contains_index: Dict[str, List['HeaderFile']] = {}
+  name_index: Dict[str, List['HeaderFile']] = {}
+  for header in headers:
+    name_index.setdefault(header.path.name, []).append(header)
+    for name in header.contains:
+      contains_index.setdefault(name, []).append(header)
+
+  def get_direct_dependencies(header: 'HeaderFile') -> List['HeaderFile']:
+    if len(header.depends) == 0:
+      return []
+    deps = set()
+    for header_name in header.get_additional_dependency_names():
+      deps.update(name_index.get(header_name, []))
+    for name in header.depends:
+      deps.update(contains_index.get(name, []))
+    deps.discard(header)
+    return sorted(deps, key=lambda h: header_order[h])
+
+  direct_dependencies = {header: get_direct_dependencies(header) for header in headers}
+  result = {}
+  for header in headers:
+    header_deps = []
+    visited = {header}
+    worklist = list(reversed(direct_dependencies[header]))
+    while len(worklist) > 0:
+      dependency = worklist.pop()
+      if dependency in visited:
+        continue
+      visited.add(dependency)
+      header_deps.append(dependency)
+      worklist.extend(reversed(direct_dependencies[dependency]))
+    result[header] = header_deps
+  return result
+
 class HeaderEnvironment():
   def __init__(self, data: Optional[ParsedData]):
     self.data = data
@@ -123,7 +166,7 @@ class HeaderEnvironment():
             current_mapping[typedef.name] = scope + typedef.name
         for enum in data.enums:
           if not name_is_anonymous(enum.typename):
-            enum_name = '::'.join([seg.name for seg in enum.typename.segments])
+            enum_name = get_name(enum.typename)
             current_mapping[enum_name] = scope + enum_name
 
         for cls in data.classes:
@@ -163,7 +206,7 @@ class HeaderEnvironment():
           current_mapping[typedef.name] = scope + typedef.name
       for enum in data.enums:
         if not name_is_anonymous(enum.typename):
-          enum_name = '::'.join([seg.name for seg in enum.typename.segments])
+          enum_name = get_name(enum.typename)
           current_mapping[enum_name] = scope + enum_name
 
       for cls in data.classes:
@@ -50,6 +50,8 @@ if TYPE_CHECKING:
   from visp_python_bindgen.submodule import Submodule
   from visp_python_bindgen.header import HeaderFile, HeaderEnvironment, BoundObjectNames
 
+log = logging.getLogger(__name__)
+
 def cpp_operator_list():
   '''
   List of cpp methods that are considered operators.
@@ -146,6 +148,19 @@ def lambda_nary_op(python_ident: str, python_op_name: str, cpp_op: str, method_i
 }}, {", ".join(py_args)});'''
 
 
+def operator_dispatch_map(op_map: Dict[str, str]) -> Dict[str, Tuple[str, str]]:
+  '''
+  Index an operator map by C++ method name, for a direct lookup: method name (e.g., operator+) => (cpp symbol, python name)
+  '''
+  return {f'operator{cpp_op}': (cpp_op, python_op_name) for cpp_op, python_op_name in op_map.items()}
+
+# Built once, looked up for every method of every class
+CPP_OPERATOR_NAMES = frozenset(cpp_operator_list())
+CONST_RETURN_UNARY_OPERATORS = operator_dispatch_map(supported_const_return_unary_op_map())
+CONST_RETURN_BINARY_OPERATORS = operator_dispatch_map(supported_const_return_binary_op_map())
+IN_PLACE_BINARY_OPERATORS = operator_dispatch_map(supported_in_place_binary_op_map())
+NARY_OPERATORS = operator_dispatch_map(supported_nary_op_map())
+
 def find_and_define_repr_str(cls: ClassScope, cls_name: str, python_ident: str) -> str:
   for friend in cls.friends:
     if friend.fn is not None:
@@ -286,16 +301,23 @@ def define_method(method: types.Method, method_config: Dict, is_class_method, sp
     return_type = get_type(method.return_type, specs, header_env.mapping)
   param_is_function_ptr = [is_function_pointer(param.type) for param in method.parameters]
 
-  method_signature = get_method_signature(method_name,
-                                          get_type(method.return_type, {}, header_env.mapping),
-                                          [get_type(param.type, {}, header_env.mapping) for param in method.parameters])
+  # Types without specializations, used in the signature and to match with doc.
+  # Without specializations, they are the same as the types resolved above
+  if len(specs) == 0:
+    unspecialized_return_type = return_type if not return_type_is_enable_if else get_type(method.return_type, {}, header_env.mapping)
+    unspecialized_params_strs = params_strs
+  else:
+    unspecialized_return_type = get_type(method.return_type, {}, header_env.mapping)
+    unspecialized_params_strs = [get_type(param.type, {}, header_env.mapping) for param in method.parameters]
+
+  method_signature = get_method_signature(method_name, unspecialized_return_type, unspecialized_params_strs)
 
   # Detect input and output parameters for a method
   use_default_param_policy = method_config['use_default_param_policy']
   param_is_input, param_is_output = method_config['param_is_input'], method_config['param_is_output']
   if use_default_param_policy or param_is_input is None and param_is_output is None:
     param_is_input = [True for _ in range(len(method.parameters))]
-    param_is_output = list(map(lambda param: is_non_const_ref_to_immutable_type(param.type), method.parameters))
+    param_is_output = [is_non_const_ref_to_immutable_type(param.type) for param in method.parameters]
     if any(param_is_output): # Emit a warning when using default policy
       header.submodule.report.add_default_policy_method(bound_object.cpp_no_template_name, method, method_signature, param_is_input, param_is_output)
 
@@ -335,17 +357,17 @@ def define_method(method: types.Method, method_config: Dict, is_class_method, sp
   if header.documentation_holder is not None:
     if is_class_method:
       method_doc_signature = MethodDocSignature(method_name,
-                                                get_type(method.return_type, {}, header_env.mapping), # Don't use specializations so that we can match with doc
-                                                [get_type(param.type, {}, header_env.mapping) for param in method.parameters],
+                                                unspecialized_return_type, # Don't use specializations so that we can match with doc
+                                                unspecialized_params_strs,
                                                 method.const, method.static)
     else:
       method_doc_signature = MethodDocSignature(method_name,
-                                                get_type(method.return_type, {}, header_env.mapping), # Don't use specializations so that we can match with doc
-                                                [get_type(param.type, {}, header_env.mapping) for param in method.parameters],
+                                                unspecialized_return_type, # Don't use specializations so that we can match with doc
+                                                unspecialized_params_strs,
                                                 True, True)
     method_doc = header.documentation_holder.get_documentation_for_method(bound_object.cpp_no_template_name, method_doc_signature, {}, specs, input_param_names, output_param_names)
     if method_doc is None:
-      logging.warning(f'Could not find documentation for {bound_object.cpp_name}::{method_name}!')
+      log.warning('Could not find documentation for %s::%s!', bound_object.cpp_name, method_name)
     else:
       pybind_options = [method_doc.documentation] + pybind_options
 
@@ -484,7 +506,7 @@ def get_bindable_methods_with_config(submodule: 'Submodule', methods: List[types
     for predicate, motive in filtering_predicates_and_motives:
       if predicate(method, method_config):
         return_str = '' if method.return_type is None else (get_type(method.return_type, {}, mapping) or '<unparsed>')
-        method_name = '::'.join(seg.name for seg in method.name.segments)
+        method_name = get_name(method.name)
         param_strs = [get_type(param.type, {}, mapping) or '<unparsed>' for param in method.parameters]
         rejected_methods.append(RejectedMethod(cls_name, method, method_config, get_method_signature(method_name, return_str, param_strs), motive))
         method_can_be_bound = False
@@ -42,6 +42,8 @@ from visp_python_bindgen.header import HeaderFile
 from visp_python_bindgen.utils import *
 from visp_python_bindgen.gen_report import Report
 
+log = logging.getLogger(__name__)
+
 class Submodule():
   def __init__(self, name: str, include_path: Path, config_file_path: Path, submodule_file_path: Path):
     self.name = name
@@ -91,7 +93,7 @@ class Submodule():
         included_config_path: Path = path.parent / included_config_filename
         if not included_config_path.exists():
           raise RuntimeError(f'Sub config file {included_config_path} does not exist')
-        logging.info(f'Trying to load subconfig file: {included_config_path}')
+        log.info('Trying to load subconfig file: %s', included_config_path)
         with open(included_config_path, 'r', encoding='utf-8') as additional_config_file:
           additional_config = json.load(additional_config_file)
         self.add_subconfig_file(config, additional_config)
@@ -249,6 +251,17 @@ options.disable_enum_members_docstring();
       return default_config
     default_config.update(self.config['classes'][class_name])
     return default_config
+  def get_header_config(self, header_name: str) -> Dict:
+    default_config = {
+      'use_full_preprocessor': False,
+    }
+    if 'headers' not in self.config:
+      return default_config
+    if header_name not in self.config['headers']:
+      return default_config
+    default_config.update(self.config['headers'][header_name])
+    return default_config
+
   def get_enum_config(self, enum_name: str) -> Optional[Dict]:
     default_config = {
       'ignore': False,
@@ -296,8 +309,8 @@ def get_submodules(config_path: Path, generate_path: Path) -> List[Submodule]:
       continue
     # The headers are already filtered: they should all come from the ViSP source folder (no vpConfig, etc.)
     include_dir = headers[0].parent
-    hh = "\n".join(map(lambda s: str(s), headers))
-    assert all(map(lambda header_path: header_path.parent == include_dir, headers)), f'Found headers in different directory, this case is not yet handled. Headers = {hh}'
+    hh = "\n".join([str(s) for s in headers])
+    assert all(header_path.parent == include_dir for header_path in headers), f'Found headers in different directory, this case is not yet handled. Headers = {hh}'
     submodule = Submodule(module_data.name, include_dir, config_path, generate_path / f'{module_data.name}.cpp')
     result[module_data.name] = submodule
 
@@ -311,8 +324,7 @@ def sort_submodules(submodules: List[Submodule]) -> List[Submodule]:
   res = []
   submodules_tmp = submodules.copy()
   while len(res) < len(submodules):
-    can_add = lambda submodule: all(map(lambda dep: dep in res, submodule.dependencies))
-    res_round = list(filter(can_add, submodules_tmp))
+    res_round = [submodule for submodule in submodules_tmp if all(dep in res for dep in submodule.dependencies)]
     submodules_tmp = [submodule for submodule in submodules_tmp if submodule not in res_round]
     res += res_round
   return res
@@ -34,7 +34,7 @@
 #############################################################################
 
 from typing import List, Optional, Set, Tuple, Dict, Union
-import copy
+import dataclasses
 from enum import Enum
 from dataclasses import dataclass
 
@@ -85,14 +85,13 @@ class MethodBinding:
   method_data: Optional[MethodData] = None
 
   def get_definition_in_child_class(self, child_py_ident) -> 'MethodBinding':
+    # Bindings are not modified once created: shallow copies are enough, and avoid deep copying the parsed method of method_data
     if self.is_constructor:
       raise RuntimeError('We should not try to redefine a constructor for a child class')
     if self.is_lambda:
-      return copy.deepcopy(self)
+      return dataclasses.replace(self)
     new_binding_code = self.method_data.as_lambda(child_py_ident)
-    res = copy.deepcopy(self)
-    res.binding = new_binding_code
-    return res
+    return dataclasses.replace(self, binding=new_binding_code)
 
 @dataclass
 class ClassBindingDefinitions:
@@ -207,7 +206,7 @@ def get_typename(typename: types.PQName, owner_specs, header_env_mapping) -> str
       spec_str = f'<{", ".join(template_strs)}>'
 
     return segment_name + spec_str
-  segment_reprs = list(map(segment_repr, typename.segments))
+  segment_reprs = [segment_repr(segment) for segment in typename.segments]
   # Through environment mapping, it is possible that a segment is resolved into two "segments"
   # E.g. a class "vpA" in a namespace "vp" is resolve to "vp::vpA"
   # If we resolve for the segments ["vp", "vpA"], we will obtain "vp::vp::vpA"